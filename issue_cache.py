@@ -0,0 +1,49 @@
+import hashlib
+import os
+import shelve
+import time
+from typing import Dict, List, Optional
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'jira-bot')
+
+
+class IssueCache:
+    """On-disk cache of raw search results, keyed by the query that produced them.
+
+    Each entry holds the raw issue JSON together with the time it was last
+    refreshed, so a later run only has to ask Jira for the issues updated since
+    then. Entries whose last full fetch is older than `max_age` seconds are
+    ignored and fetched again from scratch.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_age: float = 24 * 60 * 60):
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self._path = os.path.join(cache_dir, 'issues')
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Build a cache key from the parts of a query."""
+        return hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()
+
+    def load(self, key: str) -> Optional[Dict]:
+        """Return the entry for a key, or None if missing or expired.
+
+        An entry is a dict with 'issues' (raw issue JSON), 'fetched_at' (last
+        refresh) and 'full_fetch_at' (last complete fetch), as epoch seconds.
+        """
+        try:
+            with shelve.open(self._path, flag='r') as db:
+                entry = db.get(key)
+        except Exception:
+            # No cache yet (or unreadable) - behave as a miss
+            return None
+        if entry is None or time.time() - entry['full_fetch_at'] > self.max_age:
+            return None
+        return entry
+
+    def store(self, key: str, raw_issues: List[Dict], fetched_at: float, full_fetch_at: float):
+        """Save raw issues under a key along with when they were fetched."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with shelve.open(self._path) as db:
+            db[key] = {'issues': raw_issues, 'fetched_at': fetched_at, 'full_fetch_at': full_fetch_at}
@@ -0,0 +1,92 @@
+import random
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """Throttle requests made through a session using Jira's rate limit headers.
+
+    Concurrency is bounded by a semaphore and request pacing by a token bucket
+    that is (re)configured from the x-ratelimit-* headers of every response.
+    The semaphore is only held for the duration of the HTTP call itself - never
+    while sleeping - so one throttled worker can't stall the others.
+    """
+
+    def __init__(self, session, max_concurrency: int = 5, max_retries: int = 5, base_backoff: float = 1.0):
+        self.session = session
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self._semaphore = threading.Semaphore(max_concurrency)
+        self._lock = threading.Lock()
+        # Unthrottled until the server tells us its limits
+        self._capacity: Optional[float] = None
+        self._fill_rate: Optional[float] = None  # tokens per second
+        self._tokens = 0.0
+        self._last_refill = time.monotonic()
+
+    def get(self, url: str, **kwargs):
+        """Rate-limited equivalent of session.get, retrying on HTTP 429."""
+        for attempt in range(self.max_retries + 1):
+            self._acquire_token()
+            with self._semaphore:
+                response = self.session.get(url, **kwargs)
+            self._update_from_headers(response)
+
+            if response.status_code != 429 or attempt == self.max_retries:
+                break
+            # Back off this worker only; the others keep their own pace
+            time.sleep(self._retry_delay(response, attempt))
+
+        response.raise_for_status()
+        return response
+
+    def _acquire_token(self):
+        """Block until the token bucket allows another request."""
+        while True:
+            with self._lock:
+                if self._fill_rate is None:
+                    return
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._last_refill) * self._fill_rate)
+                self._last_refill = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self._fill_rate
+            time.sleep(wait)
+
+    def _update_from_headers(self, response):
+        """Reconfigure the token bucket from x-ratelimit-* response headers."""
+        headers = response.headers
+        try:
+            fill_rate = float(headers['x-ratelimit-fillrate'])
+            interval = float(headers['x-ratelimit-interval-seconds'])
+            capacity = float(headers.get('x-ratelimit-limit', fill_rate))
+        except (KeyError, ValueError):
+            return
+        if fill_rate <= 0 or interval <= 0:
+            return
+
+        with self._lock:
+            self._fill_rate = fill_rate / interval
+            self._capacity = capacity
+            remaining = headers.get('x-ratelimit-remaining')
+            if remaining is not None:
+                try:
+                    self._tokens = min(capacity, float(remaining))
+                except ValueError:
+                    pass
+            elif self._tokens > capacity:
+                self._tokens = capacity
+            self._last_refill = time.monotonic()
+
+    def _retry_delay(self, response, attempt: int) -> float:
+        """Seconds to wait before retrying a 429: Retry-After if given, else exponential backoff."""
+        retry_after = response.headers.get('Retry-After')
+        if retry_after is not None:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return self.base_backoff * 2 ** attempt * (1 + random.random())
@@ -1,11 +1,47 @@
 import os
+import functools
+import math
+import re
+import time
 from config import server, email, api_token
 from jira import JIRA
-from datetime import datetime
-from collections import defaultdict
-import pytz
+from jira.resources import Issue
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from rate_limiter import RateLimiter
+from issue_cache import IssueCache, DEFAULT_CACHE_DIR
+from collections import OrderedDict
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import orjson
 import sys
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
+
+# Configuration options for grouping
+GROUPING_OPTIONS = {
+    'impact': {
+        'field_id': 'customfield_10068',  # Impact field (High/Medium/Low)
+        'field_name': 'Impact',
+        'description': 'Group by Impact level (Low, Medium, High)'
+    },
+    'idea_category': {
+        'field_id': 'customfield_10476',
+        'field_name': 'Idea Category', 
+        'description': 'Group by Idea Category'
+    }
+}
+
+def _analysis_fields(custom_field_id: str) -> str:
+    """Search fields needed to analyze issues grouped by the given custom field."""
+    return f'summary,status,{custom_field_id},created'
+
+# Search fields needed to analyze issues in each grouping mode
+FIELDS_BY_MODE = {mode: _analysis_fields(cfg['field_id']) for mode, cfg in GROUPING_OPTIONS.items()}
+# Search fields needed to list issues
+SUMMARY_FIELDS = 'summary,status'
 
 class JiraStatusAnalyzer:
     # Define the expected status flow - updated with all CN project statuses
@@ -31,121 +67,341 @@ class JiraStatusAnalyzer:
         'Done',
         'On Hold'
     ]
+    # Durations are accumulated in arrays indexed by status; anything outside
+    # the expected flow is lumped into a trailing 'Other' bucket
+    OTHER_STATUS = 'Other'
+    STATUS_INDEX = {status: i for i, status in enumerate(EXPECTED_STATUSES)}
+    OTHER_INDEX = len(EXPECTED_STATUSES)
+    STATUS_COLUMNS = EXPECTED_STATUSES + [OTHER_STATUS]
+    _UTC = timezone.utc
+    # Bounds for analyze_single_issue's changelog cache; past the TTL the issue is
+    # fetched again so status changes made since show up
+    _SINGLE_ISSUE_CACHE_SIZE = 128
+    _SINGLE_ISSUE_CACHE_TTL = 5 * 60
+
+    def __init__(self, server: str, email: str, api_token: str, cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                 async_workers: int = 5):
+        """Initialize the JiraStatusAnalyzer with JIRA credentials; pass cache_dir=None to disable the issue cache.
+
+        Nothing is sent to JIRA until the first request that needs it.
+        """
+        self._server = server
+        self._issue_options = dict(JIRA.DEFAULT_OPTIONS, server=server)
+        self._basic_auth = (email, api_token)
+        self.async_workers = async_workers
+        self._issue_cache = IssueCache(cache_dir) if cache_dir else None
+        # issue key -> (fetched at, parsed changelog), least recently used first
+        self._single_issue_changes: OrderedDict = OrderedDict()
+
+    @functools.cached_property
+    def jira(self) -> JIRA:
+        """JIRA client, created on first use."""
+        return JIRA(server=self._server, basic_auth=self._basic_auth)
+
+    @functools.cached_property
+    def _search_session(self) -> requests.Session:
+        """Plain HTTP session for the paginated search, kept apart from the JIRA client's.
+
+        The client's ResilientSession retries (and sleeps on) 429s inside the call,
+        which would hide the rate limit from the rate limiter.
+        """
+        session = requests.Session()
+        session.auth = self._basic_auth
+        session.headers.update({'Accept': 'application/json'})
+        # Size the connection pool to the page fetch workers so they all keep their
+        # connection alive; transient gateway errors are retried at this level.
+        # urllib3 would otherwise also retry any 429 carrying Retry-After, sleeping
+        # inside the call - 429s are the rate limiter's job
+        adapter = HTTPAdapter(
+            pool_connections=self.async_workers,
+            pool_maxsize=self.async_workers,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504],
+                              respect_retry_after_header=False, raise_on_status=False)
+        )
+        session.mount('https://', adapter)
+        return session
 
-    def __init__(self, server: str, email: str, api_token: str):
-        """Initialize the JiraStatusAnalyzer with JIRA credentials."""
-        self.jira = JIRA(server=server, basic_auth=(email, api_token))
-        self.myself = self.jira.myself()
-        print(f"Logged in as: {self.myself['displayName']} ({self.myself['emailAddress']})")
+    @functools.cached_property
+    def _rate_limiter(self) -> RateLimiter:
+        """Rate limiter wrapping the search session."""
+        return RateLimiter(self._search_session, max_concurrency=self.async_workers)
+
+    @functools.cached_property
+    def myself(self) -> Dict:
+        """Details of the logged in user, fetched on first access."""
+        myself = self.jira.myself()
+        print(f"Logged in as: {myself['displayName']} ({myself['emailAddress']})")
+        return myself
+
+    def _fetch_page(self, jql_query: str, start_at: int, page_size: int, fields: str, include_changelog: bool) -> Dict:
+        """Fetch a single page of search results as raw JSON."""
+        # Use direct REST API call for pagination
+        url = f"{self._server.rstrip('/')}/rest/api/3/search"
+        params = {
+            'jql': jql_query,
+            'startAt': start_at,
+            'maxResults': page_size,
+            'fields': fields
+        }
+        if include_changelog:
+            params['expand'] = 'changelog'
+        response = self._rate_limiter.get(url, params=params)
+        # orjson parses the raw bytes directly, skipping the text decode
+        return orjson.loads(response.content)
+
+    def get_issues_by_jql(self, jql_query: str, max_results_per_page: int = 1000,
+                          fields: str = FIELDS_BY_MODE['idea_category'], async_workers: Optional[int] = None,
+                          include_changelog: bool = True, use_cache: bool = True) -> List[Issue]:
+        """Fetch all issues based on JQL query using pagination.
+
+        `fields` is the comma-separated list of fields to request. The changelog
+        is by far the largest part of the response, so it's only requested when
+        `include_changelog` is set. With `use_cache`, results are kept on disk and
+        later runs only fetch the issues updated since. `async_workers` defaults
+        to, and is capped at, the analyzer's worker count, which the connection
+        pool and rate limiter are sized for.
+        """
+        if async_workers is None or async_workers > self.async_workers:
+            async_workers = self.async_workers
+        cache = self._issue_cache if use_cache else None
+        cache_key = IssueCache.make_key(self._server, self._basic_auth[0], jql_query, fields, include_changelog)
+        entry = cache.load(cache_key) if cache else None
+        started_at = time.time()
+
+        if entry is None:
+            raw_issues, complete = self._fetch_raw_issues(jql_query, max_results_per_page, fields,
+                                                          include_changelog, async_workers)
+            full_fetch_at = started_at
+        else:
+            # Only ask for what changed since the last run and merge it into the cached set
+            minutes = math.ceil((started_at - entry['fetched_at']) / 60) + 1
+            print(f"Using {len(entry['issues'])} cached issues, checking for updates in the last {minutes} minutes")
+            delta, complete = self._fetch_raw_issues(self._updated_since_jql(jql_query, minutes), max_results_per_page,
+                                                     fields, include_changelog, async_workers)
+            merged = {raw['key']: raw for raw in entry['issues']}
+            merged.update((raw['key'], raw) for raw in delta)
+            raw_issues = list(merged.values())
+            full_fetch_at = entry['full_fetch_at']
+
+            # The delta can't show issues that stopped matching the query (e.g. moved out of
+            # a status filter), so prune against a keys-only listing of the full query
+            if complete:
+                listing, complete = self._fetch_raw_issues(jql_query, max_results_per_page, 'key', False,
+                                                           async_workers)
+            if complete:
+                keys = [raw['key'] for raw in listing]
+                if all(key in merged for key in keys):
+                    # Keep the query's own ordering too
+                    raw_issues = [merged[key] for key in keys]
+                else:
+                    # Issues started matching without being updated - start over
+                    print("Cached issues are out of date, fetching all issues again")
+                    raw_issues, complete = self._fetch_raw_issues(jql_query, max_results_per_page, fields,
+                                                                  include_changelog, async_workers)
+                    full_fetch_at = started_at
 
-    def get_issues_by_jql(self, jql_query: str, max_results_per_page: int = 100, custom_field_id: str = 'customfield_10476') -> List[Dict]:
-        """Fetch all issues based on JQL query using pagination."""
-        all_issues = []
-        start_at = 0
+        # Never cache a partial result, the next delta fetch would miss the gaps
+        if cache and complete:
+            cache.store(cache_key, raw_issues, started_at, full_fetch_at)
+
+        # Build JIRA issue objects from the pages we already have - the search
+        # was expanded with the changelog if needed, so there's no need to re-fetch each one
+        return [self._issue_from_raw(raw) for raw in raw_issues]
+
+    @staticmethod
+    def _updated_since_jql(jql_query: str, minutes: int) -> str:
+        """Restrict a JQL query to issues updated in the last `minutes` minutes, keeping its ORDER BY."""
+        parts = re.split(r'\border\s+by\b', jql_query, maxsplit=1, flags=re.IGNORECASE)
+        where = parts[0].strip()
+        jql = f"({where}) AND updated >= -{minutes}m" if where else f"updated >= -{minutes}m"
+        if len(parts) > 1:
+            jql += f" ORDER BY {parts[1].strip()}"
+        return jql
+
+    def _fetch_raw_issues(self, jql_query: str, max_results_per_page: int, fields: str, include_changelog: bool,
+                          async_workers: int) -> Tuple[List[Dict], bool]:
+        """Fetch the raw JSON of all issues matching a JQL query.
+
+        Jira silently caps maxResults server-side, so the first page tells us the
+        real page size; the total count also comes with it, no separate count call.
+        Once the total is known every startAt offset is too, so the remaining pages
+        are fetched concurrently by up to `async_workers` threads.
+
+        Returns the issues fetched and whether every page was fetched successfully.
+        """
+        page_size = max_results_per_page
         
-        # First get the total count using enhanced search
         try:
-            count_response = self.jira.enhanced_search_issues(
-                jql_query,
-                maxResults=0,  # This will only return the count
-                fields=['summary']  # Minimal fields for count
-            )
-            total_issues = count_response.total
-            print(f"Found {total_issues} issues in total")
+            data = self._fetch_page(jql_query, 0, page_size, fields, include_changelog)
         except Exception as e:
-            print(f"Error getting total count: {str(e)}")
-            if hasattr(e, 'response'):
-                print(f"Response status: {e.response.status_code if hasattr(e.response, 'status_code') else 'N/A'}")
-                print(f"Response text: {e.response.text if hasattr(e.response, 'text') else 'N/A'}")
-            return all_issues
+            self._print_request_error("Error fetching issues", e)
+            return [], False
         
-        while True:
-            try:
-                # Use direct REST API call for pagination
-                url = f"{self.jira._options['server']}/rest/api/3/search"
-                params = {
-                    'jql': jql_query,
-                    'startAt': start_at,
-                    'maxResults': max_results_per_page,
-                    'expand': 'changelog',
-                    'fields': f'summary,status,{custom_field_id},created'
-                }
-                response = self.jira._session.get(url, params=params)
-                response.raise_for_status()
-                data = response.json()
-                
-                # Convert the JSON response to JIRA issue objects
-                issues_page = [self.jira.issue(raw['key'], expand='changelog') for raw in data['issues']]
-                
-                # Add issues from this page to our results
-                all_issues.extend(issues_page)
-                print(f"Fetched {len(all_issues)} of {total_issues} issues...")
-                
-                # If we've fetched all issues, break
-                if len(all_issues) >= total_issues:
-                    break
-                    
-                # Move to the next page
-                start_at += max_results_per_page
-                
-            except Exception as e:
-                print(f"Error fetching issues: {str(e)}")
-                if hasattr(e, 'response'):
-                    print(f"Response status: {e.response.status_code if hasattr(e.response, 'status_code') else 'N/A'}")
-                    print(f"Response text: {e.response.text if hasattr(e.response, 'text') else 'N/A'}")
-                break
+        total_issues = data['total']
+        print(f"Found {total_issues} issues in total")
+        
+        # A short non-final page means the server capped maxResults
+        returned = len(data['issues'])
+        if 0 < returned < page_size and returned < total_issues:
+            print(f"Server capped page size at {returned} (requested {page_size})")
+            page_size = returned
+        
+        pages = [data]
+        complete = True
+        fetched = returned
+        print(f"Fetched {fetched} of {total_issues} issues...")
+        offsets = range(returned, total_issues, page_size) if returned else range(0)
+        if offsets:
+            with ThreadPoolExecutor(max_workers=async_workers) as executor:
+                futures = [executor.submit(self._fetch_page, jql_query, start_at, page_size, fields, include_changelog)
+                           for start_at in offsets]
+                # Merge in offset order; stop at the first failed page like the sequential loop did
+                for future in futures:
+                    try:
+                        pages.append(future.result())
+                        fetched += len(pages[-1]['issues'])
+                        print(f"Fetched {fetched} of {total_issues} issues...")
+                    except Exception as e:
+                        self._print_request_error("Error fetching issues", e)
+                        for pending in futures:
+                            pending.cancel()
+                        complete = False
+                        break
         
-        return all_issues
-
-    def _get_status_changes(self, issue) -> List[Dict]:
-        """Extract status changes from an issue's changelog."""
-        status_changes = []
-        for history in issue.changelog.histories:
-            for item in history.items:
-                if item.field == 'status':
-                    status_changes.append({
-                        'from_status': item.fromString if item.fromString else 'None',
-                        'to_status': item.toString if item.toString else 'None',
-                        'timestamp': datetime.strptime(history.created, '%Y-%m-%dT%H:%M:%S.%f%z')
-                    })
-        return sorted(status_changes, key=lambda x: x['timestamp'])
-
-    def _calculate_status_durations(self, status_changes: List[Dict]) -> Dict[str, float]:
-        """Calculate time spent in each status for a given list of status changes."""
-        status_durations = defaultdict(float)
-        if not status_changes:
-            return status_durations
-
-        current_status = 'New Issues'
-        current_time = status_changes[0]['timestamp']
-
-        for change in status_changes:
-            duration = (change['timestamp'] - current_time).total_seconds() / 3600
-            status_durations[current_status] += duration
-            current_status = change['to_status']
-            current_time = change['timestamp']
-
-        # If not in Done status, calculate time until now
-        if current_status != 'Done':
-            now = datetime.now(pytz.UTC)
-            duration = (now - current_time).total_seconds() / 3600
-            status_durations[current_status] += duration
-
-        return status_durations
-
-    def analyze_single_issue(self, issue_key: str) -> Dict[str, float]:
-        """Analyze status durations for a single issue."""
-        issue = self.jira.issue(issue_key, expand='changelog')
-        status_changes = self._get_status_changes(issue)
+        return [raw for page in pages for raw in page['issues']], complete
+
+    def _issue_from_raw(self, raw: Dict) -> Issue:
+        """Wrap raw issue JSON in an Issue, leaving the changelog as plain JSON.
+
+        The changelog is only ever read from issue.raw, so there's no point in
+        having the jira library convert every history entry into PropertyHolders.
+        The Issue gets no session: these are read-only snapshots, and creating the
+        JIRA client just for its options would cost a serverInfo round trip.
+        """
+        changelog = raw.pop('changelog', None)
+        issue = Issue(self._issue_options, None, raw=raw)
+        if changelog is not None:
+            raw['changelog'] = changelog
+        return issue
+
+    def get_issue_summaries(self, jql_query: str, max_results_per_page: int = 1000) -> List[Issue]:
+        """Fetch key, summary and current status of all issues matching the JQL query, without changelogs."""
+        return self.get_issues_by_jql(jql_query, max_results_per_page, SUMMARY_FIELDS, include_changelog=False)
+
+    def _print_request_error(self, message: str, e: Exception):
+        """Print an error along with the HTTP response details, if any."""
+        print(f"{message}: {str(e)}")
+        if hasattr(e, 'response'):
+            print(f"Response status: {e.response.status_code if hasattr(e.response, 'status_code') else 'N/A'}")
+            print(f"Response text: {e.response.text if hasattr(e.response, 'text') else 'N/A'}")
+
+    def _get_status_changes(self, issue) -> Tuple[np.ndarray, List[str]]:
+        """Extract status changes from an issue's changelog (Issue object or raw issue dict).
+
+        The result is memoized on Issue objects, as each issue has exactly one
+        changelog; raw dicts are the caller's data and are parsed every time.
+        """
+        if isinstance(issue, dict):
+            return self._parse_status_changes(issue)
+
+        status_changes = getattr(issue, '_status_changes_cache', None)
+        if status_changes is None:
+            status_changes = self._parse_status_changes(issue.raw)
+            issue._status_changes_cache = status_changes
+        return status_changes
+
+    def _parse_status_changes(self, raw: Dict) -> Tuple[np.ndarray, List[str]]:
+        """Walk a raw issue's changelog and collect its status changes, oldest first.
+
+        Returns the change timestamps (UTC, as datetime64[ns]) and the status
+        each change moved to, as two parallel sequences.
+        """
+        status_items = [(history['created'], item.get('toString') or 'None')
+                        for history in raw['changelog']['histories']
+                        for item in history['items'] if item['field'] == 'status']
+        if not status_items:
+            return np.array([], dtype='datetime64[ns]'), []
+        raw_times, to_statuses = zip(*status_items)
+
+        # Parse all timestamps in one vectorized call rather than one at a time
+        times = pd.to_datetime(list(raw_times), format='ISO8601', cache=True, utc=True)
+        timestamps = times.tz_convert(None).to_numpy(dtype='datetime64[ns]')
+        order = np.argsort(timestamps, kind='stable')
+        return timestamps[order], [to_statuses[i] for i in order]
+
+    def _calculate_status_durations(self, status_changes: Tuple[np.ndarray, List[str]],
+                                    now: Optional[datetime] = None) -> Tuple[np.ndarray, Dict[str, float]]:
+        """Calculate time spent in each status for a given list of status changes.
+
+        Returns hours per status in STATUS_COLUMNS order, NaN for statuses the issue
+        never entered, along with the hours per unexpected status that make up the
+        'Other' bucket. `now` closes the interval of an issue that isn't Done yet;
+        pass it in when analyzing many issues so they're all measured against the
+        same moment.
+        """
+        timestamps, to_statuses = status_changes
+        status_durations = np.zeros(len(self.STATUS_COLUMNS))
+        visited = np.zeros(len(self.STATUS_COLUMNS), dtype=bool)
+        if not to_statuses:
+            status_durations[:] = np.nan
+            return status_durations, {}
+
+        # The issue sits in 'New Issues' until its first change (counted from that
+        # change, so 0 hours), then in each status until the next change
+        ends = timestamps
+        if to_statuses[-1] != 'Done':
+            # If not in Done status, calculate time until now
+            if now is None:
+                now = datetime.now(self._UTC)
+            now = np.datetime64(now.astimezone(self._UTC).replace(tzinfo=None), 'ns')
+            ends = np.append(timestamps, now)
+            statuses = ['New Issues'] + to_statuses
+        else:
+            statuses = ['New Issues'] + to_statuses[:-1]
+        durations = np.diff(ends, prepend=timestamps[0]) / np.timedelta64(1, 'h')
+
+        indices = [self.STATUS_INDEX.get(status, self.OTHER_INDEX) for status in statuses]
+        np.add.at(status_durations, indices, durations)
+        visited[indices] = True
+
+        unexpected_durations = {}
+        for status, index, duration in zip(statuses, indices, durations.tolist()):
+            if index == self.OTHER_INDEX:
+                unexpected_durations[status] = unexpected_durations.get(status, 0.0) + duration
+
+        status_durations[~visited] = np.nan
+        return status_durations, unexpected_durations
+
+    def analyze_single_issue(self, issue_key: str) -> Tuple[np.ndarray, Dict[str, float]]:
+        """Analyze status durations (and unexpected status durations) for a single issue.
+
+        The parsed changelog is cached per issue key for a few minutes (LRU-bounded);
+        the durations are computed fresh on every call so time in the current status
+        stays up to date.
+        """
+        cached = self._single_issue_changes.get(issue_key)
+        if cached is not None and time.monotonic() - cached[0] <= self._SINGLE_ISSUE_CACHE_TTL:
+            self._single_issue_changes.move_to_end(issue_key)
+            status_changes = cached[1]
+        else:
+            issue = self.jira.issue(issue_key, expand='changelog')
+            status_changes = self._get_status_changes(issue)
+            self._single_issue_changes[issue_key] = (time.monotonic(), status_changes)
+            self._single_issue_changes.move_to_end(issue_key)
+            if len(self._single_issue_changes) > self._SINGLE_ISSUE_CACHE_SIZE:
+                self._single_issue_changes.popitem(last=False)
         return self._calculate_status_durations(status_changes)
 
-    def analyze_multiple_issues(self, jql_query: str, max_results_per_page: int = 100, 
+    def analyze_multiple_issues(self, jql_query: str, max_results_per_page: int = 1000, 
                                custom_field_id: str = 'customfield_10476', 
-                               grouping_field_name: str = 'Idea Category') -> Dict[str, Dict[str, Any]]:
+                               grouping_field_name: str = 'Idea Category',
+                               fields: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
         """Analyze status durations for all issues based on JQL query."""
+        if fields is None:
+            fields = _analysis_fields(custom_field_id)
         print(f"\nFetching issues with query: {jql_query}")
         try:
-            issues = self.get_issues_by_jql(jql_query, max_results_per_page, custom_field_id)
+            issues = self.get_issues_by_jql(jql_query, max_results_per_page, fields, include_changelog=True)
         except Exception as e:
             print(f"Error fetching issues: {str(e)}")
             return {}
@@ -153,19 +409,21 @@ class JiraStatusAnalyzer:
         results = {}
         
         print("Analyzing issues...")
+        now = datetime.now(self._UTC)
         for i, issue in enumerate(issues, 1):
             if i % 100 == 0:  # Progress indicator
                 print(f"Analyzed {i} issues...")
                 
             try:
                 status_changes = self._get_status_changes(issue)
-                durations = self._calculate_status_durations(status_changes)
+                durations, unexpected_durations = self._calculate_status_durations(status_changes, now)
                 
                 # Include custom field value in results - use the configurable field
                 custom_field_value = getattr(issue.fields, custom_field_id, None)
                 
                 results[issue.key] = {
                     'durations': durations,
+                    'unexpected_durations': unexpected_durations,
                     'summary': issue.fields.summary,
                     'grouping_field_value': custom_field_value,
                     'grouping_field_name': grouping_field_name,
@@ -179,65 +437,57 @@ class JiraStatusAnalyzer:
         print(f"Analysis complete for {len(results)} issues")
         return results
 
-    def print_status_durations(self, durations: Dict[str, float], issue_key: Optional[str] = None):
-        """Print status durations in a formatted way."""
+    def print_status_durations(self, durations: np.ndarray, unexpected_durations: Optional[Dict[str, float]] = None,
+                               issue_key: Optional[str] = None):
+        """Print status durations in a formatted way.
+
+        Takes what analyze_single_issue returns, i.e.
+        print_status_durations(*analyze_single_issue(key), issue_key=key).
+        `unexpected_durations` breaks the 'Other' bucket down by status name; without
+        it the bucket is printed as a single 'Other' line.
+        """
         if issue_key:
             print(f"\nTime spent in each status for issue {issue_key}:")
         else:
             print("\nTime spent in each status:")
 
-        total_hours = 0.0
-        for status in self.EXPECTED_STATUSES:
-            hours = durations.get(status, 0.0)
-            total_hours += hours
-            days = int(hours // 24)
-            remaining_hours = hours % 24
-            if days > 0:
-                print(f"{status}: {days} days and {remaining_hours:.1f} hours")
-            else:
-                print(f"{status}: {hours:.1f} hours")
+        hours_by_status = np.nan_to_num(durations)
+        expected_hours = hours_by_status[:self.OTHER_INDEX]
+        for status, formatted in zip(self.EXPECTED_STATUSES, self._format_times(expected_hours)):
+            print(f"{status}: {formatted}")
 
         # Print total time
-        total_days = int(total_hours // 24)
-        total_remaining_hours = total_hours % 24
+        total_hours = expected_hours.sum()
         print("\nTotal time:")
-        if total_days > 0:
-            print(f"Total: {total_days} days and {total_remaining_hours:.1f} hours")
-        else:
-            print(f"Total: {total_hours:.1f} hours")
+        print(f"Total: {self._format_time(total_hours)}")
 
-        # Print any unexpected statuses
-        unexpected_statuses = set(durations.keys()) - set(self.EXPECTED_STATUSES)
-        if unexpected_statuses:
+        # Print time spent in unexpected statuses
+        if not np.isnan(durations[self.OTHER_INDEX]):
+            if not unexpected_durations:
+                unexpected_durations = {self.OTHER_STATUS: durations[self.OTHER_INDEX]}
             print("\nNote: The following unexpected statuses were also found:")
-            for status in unexpected_statuses:
-                hours = durations[status]
+            for status, hours in unexpected_durations.items():
                 total_hours += hours  # Add unexpected status time to total
-                days = int(hours // 24)
-                remaining_hours = hours % 24
-                if days > 0:
-                    print(f"{status}: {days} days and {remaining_hours:.1f} hours")
-                else:
-                    print(f"{status}: {hours:.1f} hours")
+                print(f"{status}: {self._format_time(hours)}")
             
             # Print updated total including unexpected statuses
-            if unexpected_statuses:
-                total_days = int(total_hours // 24)
-                total_remaining_hours = total_hours % 24
-                print("\nTotal time (including unexpected statuses):")
-                if total_days > 0:
-                    print(f"Total: {total_days} days and {total_remaining_hours:.1f} hours")
-                else:
-                    print(f"Total: {total_hours:.1f} hours")
+            print("\nTotal time (including unexpected statuses):")
+            print(f"Total: {self._format_time(total_hours)}")
 
     def _format_time(self, hours: float) -> str:
         """Format time in hours to days and hours string."""
-        days = int(hours // 24)
-        remaining_hours = hours % 24
+        days, remaining_hours = divmod(hours, 24)
         if days > 0:
-            return f"{days} days and {remaining_hours:.1f} hours"
+            return f"{int(days)} days and {remaining_hours:.1f} hours"
         return f"{hours:.1f} hours"
 
+    def _format_times(self, hours: np.ndarray) -> List[str]:
+        """Format an array of times in hours (flattened), splitting days off all of them in one go."""
+        hours = np.asarray(hours, dtype=float).ravel()
+        days, remaining_hours = np.divmod(hours, 24)
+        return [f"{int(d)} days and {r:.1f} hours" if d > 0 else f"{h:.1f} hours"
+                for h, d, r in zip(hours.tolist(), days.tolist(), remaining_hours.tolist())]
+
     def print_aggregated_results(self, results: Dict[str, Dict[str, Any]]):
         """Print aggregated results for multiple issues."""
         if not results:
@@ -247,61 +497,67 @@ class JiraStatusAnalyzer:
         # Get the grouping field name from the first result
         grouping_field_name = next(iter(results.values()))['grouping_field_name'] if results else 'Category'
 
-        # Calculate averages and totals for each status
-        aggregated = defaultdict(lambda: {'total_hours': 0.0, 'count': 0})
-        grand_total_hours = 0.0
-        
-        # Group issues by the specified field and calculate category-specific stats
-        category_stats = defaultdict(lambda: {
-            'total_hours': 0.0,
-            'count': 0,
-            'issues': [],
-            'status_totals': defaultdict(float)
+        # Stack per-issue duration arrays into an (issues x statuses) matrix
+        matrix = np.vstack([issue_data['durations'] for issue_data in results.values()])
+        visited = ~np.isnan(matrix)
+
+        # Calculate averages and totals for each status, over the issues that entered it
+        status_counts = visited.sum(axis=0)
+        status_totals = np.nansum(matrix, axis=0)
+
+        # Total time per issue (issues without status changes count as 0)
+        issues_df = pd.DataFrame({
+            'issue_key': list(results),
+            'category': [str(data['grouping_field_value']) if data['grouping_field_value'] else 'Not Set'
+                         for data in results.values()],
+            'hours': np.nansum(matrix, axis=1)
         })
-        
-        for issue_key, issue_data in results.items():
-            issue_total = 0.0
-            category = issue_data['grouping_field_value'] or 'Not Set'
-            
-            # Calculate total time for this issue
-            for status, hours in issue_data['durations'].items():
-                aggregated[status]['total_hours'] += hours
-                aggregated[status]['count'] += 1
-                category_stats[category]['status_totals'][status] += hours
-                issue_total += hours
-            
-            # Update category statistics
-            category_stats[category]['total_hours'] += issue_total
-            category_stats[category]['count'] += 1
-            category_stats[category]['issues'].append(issue_key)
-            grand_total_hours += issue_total
+        grand_total_hours = issues_df['hours'].sum()
+
+        # Group issues by the specified field and calculate category-specific stats
+        category_stats = issues_df.groupby('category', sort=False).agg(
+            total_hours=('hours', 'sum'),
+            avg_hours=('hours', 'mean'),
+            count=('issue_key', 'size'),
+            issues=('issue_key', list)
+        ).sort_values('total_hours', ascending=False, kind='stable')
+        category_status_totals = pd.DataFrame(matrix, columns=self.STATUS_COLUMNS).groupby(
+            issues_df['category'].to_numpy()).sum(min_count=1)
+
+        # Format all the figures up front rather than one print at a time
+        category_stats['total_time'] = self._format_times(category_stats['total_hours'])
+        category_stats['avg_time'] = self._format_times(category_stats['avg_hours'])
+        category_status_times = pd.DataFrame(
+            np.reshape(self._format_times(np.nan_to_num(category_status_totals.to_numpy())),
+                       category_status_totals.shape),
+            index=category_status_totals.index, columns=category_status_totals.columns
+        )
+        visited_counts = np.maximum(status_counts, 1)
+        status_total_times = self._format_times(status_totals)
+        status_avg_times = self._format_times(status_totals / visited_counts)
 
         print(f"\nAggregated results for {len(results)} issues:")
 
         # Print Time to Market summary first
         print(f"\nTime to Market by {grouping_field_name}:")
         print("-" * 80)
-        for category, stats in sorted(category_stats.items(), key=lambda x: x[1]['total_hours'], reverse=True):
-            avg_hours = stats['total_hours'] / stats['count'] if stats['count'] > 0 else 0
-            print(f"{category}: {self._format_time(avg_hours)} ({stats['count']} issues)")
+        for category, stats in category_stats.iterrows():
+            print(f"{category}: {stats['avg_time']} ({stats['count']} issues)")
         print("-" * 80)
 
         # Print field breakdown
         print(f"\nBreakdown by {grouping_field_name}:")
         print("-" * 80)
-        for category, stats in sorted(category_stats.items(), key=lambda x: x[1]['total_hours'], reverse=True):
-            avg_hours = stats['total_hours'] / stats['count'] if stats['count'] > 0 else 0
-            
+        for category, stats in category_stats.iterrows():
             print(f"\n{category} ({stats['count']} issues):")
-            print(f"  Total time: {self._format_time(stats['total_hours'])}")
-            print(f"  Time to Market: {self._format_time(avg_hours)}")
+            print(f"  Total time: {stats['total_time']}")
+            print(f"  Time to Market: {stats['avg_time']}")
             
             # Print status breakdown for this category
             print("  Status breakdown:")
             for status in self.EXPECTED_STATUSES:
-                if status in stats['status_totals']:
-                    status_hours = stats['status_totals'][status]
-                    print(f"    {status}: {self._format_time(status_hours)}")
+                if not np.isnan(category_status_totals.at[category, status]):
+                    print(f"    {status}: {category_status_times.at[category, status]}")
             
             # Print issues in this category (limited to 10)
             print("  Issues:")
@@ -314,13 +570,11 @@ class JiraStatusAnalyzer:
 
         # Print overall status durations
         print("\nOverall time spent in each status:")
-        for status in self.EXPECTED_STATUSES:
-            if status in aggregated:
-                avg_hours = aggregated[status]['total_hours'] / aggregated[status]['count']
-                total_hours = aggregated[status]['total_hours']
+        for status, i in self.STATUS_INDEX.items():
+            if status_counts[i]:
                 print(f"{status}:")
-                print(f"  Total: {self._format_time(total_hours)}")
-                print(f"  Average: {self._format_time(avg_hours)}")
+                print(f"  Total: {status_total_times[i]}")
+                print(f"  Average: {status_avg_times[i]}")
 
         # Print grand total
         avg_hours = grand_total_hours / len(results) if results else 0
@@ -328,7 +582,7 @@ class JiraStatusAnalyzer:
         print(f"Total time across {len(results)} issues: {self._format_time(grand_total_hours)}")
         print(f"Average Time to Market: {self._format_time(avg_hours)}")
 
-    def run_analysis(self, jql_query: str, grouping_mode: str = 'impact', max_results_per_page: int = 100):
+    def run_analysis(self, jql_query: str, grouping_mode: str = 'impact', max_results_per_page: int = 1000):
         """
         Run analysis with the specified grouping mode.
         
@@ -337,20 +591,6 @@ class JiraStatusAnalyzer:
             grouping_mode: Either 'impact' or 'idea_category'
             max_results_per_page: Number of results per page for pagination
         """
-        # Configuration options for grouping
-        GROUPING_OPTIONS = {
-            'impact': {
-                'field_id': 'customfield_10068',  # Impact field (High/Medium/Low)
-                'field_name': 'Impact',
-                'description': 'Group by Impact level (Low, Medium, High)'
-            },
-            'idea_category': {
-                'field_id': 'customfield_10476',
-                'field_name': 'Idea Category', 
-                'description': 'Group by Idea Category'
-            }
-        }
-        
         if grouping_mode not in GROUPING_OPTIONS:
             print(f"Error: Invalid grouping mode '{grouping_mode}'. Available modes: {list(GROUPING_OPTIONS.keys())}")
             return
@@ -363,7 +603,8 @@ class JiraStatusAnalyzer:
             jql_query, 
             max_results_per_page=max_results_per_page,
             custom_field_id=config['field_id'],
-            grouping_field_name=config['field_name']
+            grouping_field_name=config['field_name'],
+            fields=FIELDS_BY_MODE[grouping_mode]
         )
         
         # Print results
@@ -383,7 +624,7 @@ if __name__ == "__main__":
     # Check for command line arguments
     grouping_mode = 'idea_category'  # Default mode changed to idea_category as requested
     if len(sys.argv) > 1:
-        if sys.argv[1] in ['impact', 'idea_category']:
+        if sys.argv[1] in GROUPING_OPTIONS:
             grouping_mode = sys.argv[1]
         else:
             print("Usage: python own.py [impact|idea_category]")